@@ -1,7 +1,151 @@
 # Register your models here.
 
-from django.contrib import admin
-from .models import Note
+from django.contrib import admin, messages
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.http import QueryDict
+from django.utils.functional import cached_property
+from .models import Note, move_notes
+from .routers import get_note_shards, shard_for_owner
+
+# PUBLIC_INTERFACE
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids an exact COUNT(*) on large unfiltered tables.
+
+    When the queryset has no filters applied, the row count is taken from the
+    database planner statistics (pg_class.reltuples on PostgreSQL, sqlite_stat1
+    on SQLite once ANALYZE has been run). Filtered querysets, or databases
+    without statistics, fall back to the exact count. Keep the statistics
+    current with `manage.py analyze_notes`.
+    """
+
+    # Below this many rows an exact count is cheap and preferred.
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        estimate = self._estimated_count()
+        if estimate is not None and estimate >= self.estimate_threshold:
+            return estimate
+        return super().count
+
+    def _estimated_count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None or query.where:
+            return None
+        connection = connections[self.object_list.db]
+        table = self.object_list.model._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+            elif connection.vendor == 'sqlite':
+                cursor.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+                )
+                if cursor.fetchone() is None:
+                    return None
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+            else:
+                return None
+            row = cursor.fetchone()
+        if row is None or row[0] is None:
+            return None
+        try:
+            estimate = int(str(row[0]).split()[0])
+        except ValueError:
+            return None
+        return estimate if estimate >= 0 else None
+
+
+def _changelist_shard(params):
+    """Return the shard a changelist with these query parameters shows."""
+    owner = params.get(OwnerIdFilter.parameter_name, '')
+    if owner.isdigit():
+        return shard_for_owner(int(owner))
+    if params.get(ShardFilter.parameter_name) in get_note_shards():
+        return params[ShardFilter.parameter_name]
+    return get_note_shards()[0]
+
+
+# PUBLIC_INTERFACE
+class ShardFilter(admin.SimpleListFilter):
+    """
+    Choose which note shard the changelist reads from (?shard=<alias>).
+
+    The changelist only ever shows one shard, so there is no "All" choice:
+    without a selection the first shard is shown, and filtering by owner
+    always reads from that owner's shard.
+    """
+    title = 'shard (one at a time)'
+    parameter_name = 'shard'
+
+    def __init__(self, request, params, model, model_admin):
+        self.shown_shard = _changelist_shard(request.GET)
+        super().__init__(request, params, model, model_admin)
+
+    def lookups(self, request, model_admin):
+        return tuple((alias, alias) for alias in get_note_shards())
+
+    def shard(self):
+        """Return the alias being shown."""
+        return self.shown_shard
+
+    def choices(self, changelist):
+        shard = self.shard()
+        for alias, title in self.lookup_choices:
+            yield {
+                'selected': alias == shard,
+                'query_string': changelist.get_query_string(
+                    {self.parameter_name: alias}, [OwnerIdFilter.parameter_name]
+                ),
+                'display': title,
+            }
+
+    def queryset(self, request, queryset):
+        return queryset.using(self.shard())
+
+
+# PUBLIC_INTERFACE
+class OwnerIdFilter(admin.SimpleListFilter):
+    """
+    Owner filter driven by user ID (?owner=<id>) instead of listing every user.
+
+    Only the currently selected owner is looked up, so the sidebar stays a
+    constant size no matter how many users exist. The sidebar has a user ID
+    box; the user admin's search finds an ID from a username.
+    """
+    title = 'owner'
+    parameter_name = 'owner'
+    template = 'admin/api/owner_id_filter.html'
+
+    def lookups(self, request, model_admin):
+        value = self.value()
+        if not value or not value.isdigit():
+            return ()
+        user = User.objects.filter(pk=value).only('username').first()
+        return ((value, user.username if user else value),)
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        # Other active filters, carried as hidden inputs by the ID box's form.
+        self.hidden_params = [
+            (name, value) for name, value in changelist.params.items() if name != self.parameter_name
+        ]
+        return super().choices(changelist)
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value and value.isdigit():
+            owner_id = int(value)
+            return queryset.using(shard_for_owner(owner_id)).filter(owner_id=owner_id)
+        return queryset
+
 
 # PUBLIC_INTERFACE
 @admin.register(Note)
@@ -9,7 +153,82 @@ class NoteAdmin(admin.ModelAdmin):
     """
     Admin interface for the Note model.
     Provides list display and search/filter capabilities for manual inspection and management.
+
+    Tuned for very large tables: owners are filtered by ID and chosen via
+    autocomplete, row counts are estimated, and search only matches title
+    prefixes or an exact owner username.
+
+    Notes are sharded by owner while users stay on the default database, so
+    owners are prefetched rather than joined and the changelist reads one
+    shard at a time. Changing a note's owner moves it to the new owner's
+    shard.
     """
     list_display = ('id', 'title', 'owner', 'created_at', 'updated_at')
-    search_fields = ('title', 'content', 'owner__username')
-    list_filter = ('created_at', 'updated_at', 'owner')
+    # Empty rather than False: False makes the changelist join owner itself.
+    list_select_related = ()
+    search_fields = ('^title',)
+    search_help_text = 'Title prefix, or exact owner username.'
+    list_filter = (ShardFilter, OwnerIdFilter, 'updated_at')
+    date_hierarchy = 'created_at'
+    autocomplete_fields = ('owner',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('owner')
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        # Users live on the default database, so resolve usernames to IDs first.
+        owner_ids = list(User.objects.filter(username=search_term).values_list('pk', flat=True))
+        return queryset.filter(Q(title__istartswith=search_term) | Q(owner_id__in=owner_ids)), False
+
+    def get_object(self, request, object_id, from_field=None):
+        """
+        Find the note, starting with the shard the changelist was showing.
+
+        Change and delete links carry the changelist filters, so that shard is
+        resolved exactly as ShardFilter does (first shard when unfiltered).
+        Note IDs are unique across shards, so a note moved since is found on
+        the others; should an ID still turn up on several of them, the lookup
+        is refused with an error rather than guessing.
+        """
+        model = self.model
+        field = model._meta.pk if from_field is None else model._meta.get_field(from_field)
+        try:
+            object_id = field.to_python(object_id)
+        except (ValidationError, ValueError):
+            return None
+        queryset = self.get_queryset(request)
+        shown = _changelist_shard(QueryDict(request.GET.get('_changelist_filters', '')))
+        obj = queryset.using(shown).filter(**{field.name: object_id}).first()
+        if obj is not None:
+            return obj
+        found = {}
+        for alias in get_note_shards():
+            if alias == shown:
+                continue
+            obj = queryset.using(alias).filter(**{field.name: object_id}).first()
+            if obj is not None:
+                found[alias] = obj
+        if len(found) <= 1:
+            return next(iter(found.values()), None)
+        self.message_user(
+            request,
+            f"Note ID {object_id} exists on several shards ({', '.join(found)}). "
+            "Open it from the changelist filtered by shard or owner.",
+            messages.ERROR,
+        )
+        return None
+
+    def save_model(self, request, obj, form, change):
+        """Save the note, moving it (same ID) to the new owner's shard if the owner changed."""
+        source = obj._state.db
+        target = shard_for_owner(obj.owner_id)
+        if not change or source in (None, target):
+            obj.save()
+            return
+        obj.save(using=source)
+        move_notes([obj], source, target)
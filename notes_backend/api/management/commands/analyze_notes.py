@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from api.models import Note
+from api.routers import get_note_shards
+
+
+class Command(BaseCommand):
+    help = "Refresh planner statistics for the notes table on every shard (run periodically, e.g. from cron)."
+
+    def handle(self, *args, **options):
+        """
+        Run ANALYZE on the notes table of each shard.
+
+        Besides helping the query planner, this is what the admin's
+        EstimatedCountPaginator reads its row counts from: on SQLite the
+        sqlite_stat1 table only exists after ANALYZE, and without it the
+        changelist falls back to an exact COUNT(*).
+        """
+        table = Note._meta.db_table
+        for alias in dict.fromkeys((DEFAULT_DB_ALIAS,) + get_note_shards()):
+            connection = connections[alias]
+            if table not in connection.introspection.table_names():
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(table)}')
+            self.stdout.write(f"Analyzed {table} on {alias}")
+        self.stdout.write(self.style.SUCCESS("Done."))
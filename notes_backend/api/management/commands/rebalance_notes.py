@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections
+
+from api.models import Note, move_notes
+from api.routers import get_note_shards, shard_for_owner
+
+
+class Command(BaseCommand):
+    help = "Move notes that are not on their owner's shard (e.g. after changing NOTE_SHARDS)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Only report how many notes would move.",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Notes copied per transaction (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Scan every shard (and the default database, which holds pre-sharding
+        notes) and move each misplaced owner's notes to shard_for_owner().
+
+        Notes keep their IDs: each shard allocates IDs from its own range,
+        so API clients' note IDs stay valid. The command is safe to re-run
+        after an interruption.
+        """
+        sources = [
+            alias for alias in dict.fromkeys((DEFAULT_DB_ALIAS,) + get_note_shards())
+            if Note._meta.db_table in connections[alias].introspection.table_names()
+        ]
+        moved = 0
+
+        for source in sources:
+            owner_ids = (
+                Note.objects.using(source).order_by()
+                .values_list('owner_id', flat=True).distinct()
+            )
+            for owner_id in list(owner_ids):
+                target = shard_for_owner(owner_id)
+                if target == source:
+                    continue
+                notes = Note.objects.using(source).filter(owner_id=owner_id)
+                if options['dry_run']:
+                    count = notes.count()
+                    moved += count
+                    self.stdout.write(f"owner {owner_id}: {count} note(s) {source} -> {target}")
+                    continue
+                while True:
+                    batch = list(notes.order_by('pk')[:options['batch_size']])
+                    if not batch:
+                        break
+                    try:
+                        move_notes(batch, source, target)
+                    except IntegrityError as exc:
+                        raise CommandError(str(exc))
+                    moved += len(batch)
+
+        verb = "Would move" if options['dry_run'] else "Moved"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {moved} note(s)."))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-19 18:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['owner', '-updated_at'], name='note_owner_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['created_at'], name='note_created_idx'),
+        ),
+    ]
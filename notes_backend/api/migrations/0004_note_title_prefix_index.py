@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# Index for the admin's title-prefix search (title__istartswith). Django
+# renders that lookup differently per backend, so the index is too:
+#   SQLite:     "title" LIKE 'x%' ESCAPE '\'  -> needs a NOCASE index on title
+#   PostgreSQL: UPPER("title"::text) LIKE UPPER('x%')  -> needs a pattern_ops
+#               index on that expression
+INDEX_NAME = 'note_title_prefix_idx'
+
+CREATE_SQL = {
+    'sqlite': f'CREATE INDEX {INDEX_NAME} ON api_note (title COLLATE NOCASE)',
+    'postgresql': f'CREATE INDEX {INDEX_NAME} ON api_note (UPPER(title::text) text_pattern_ops)',
+}
+
+
+def create_index(apps, schema_editor):
+    sql = CREATE_SQL.get(schema_editor.connection.vendor)
+    if sql:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_SQL:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_note_owner_cross_db'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-19 18:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_note_title_prefix_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NoteMove',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=100)),
+                ('source_id', models.BigIntegerField()),
+                ('note_id', models.BigIntegerField()),
+                ('completed', models.BooleanField(default=False)),
+                ('moved_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['source', 'source_id'], name='notemove_source_idx')],
+            },
+        ),
+    ]
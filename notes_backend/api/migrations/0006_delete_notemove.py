@@ -0,0 +1,16 @@
+# Generated by Django 5.2 on 2026-10-19 19:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_notemove'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='NoteMove',
+        ),
+    ]
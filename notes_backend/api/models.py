@@ -1,6 +1,28 @@
 from django.contrib.auth.models import User
 from rest_framework import serializers
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from .routers import shard_for_owner
+
+# PUBLIC_INTERFACE
+class NoteQuerySet(models.QuerySet):
+    """QuerySet that routes notes to their owner's shard (see api/routers.py)."""
+
+    # PUBLIC_INTERFACE
+    def for_owner(self, owner):
+        """Return the notes of `owner` (a user or user ID), read from that owner's shard."""
+        owner_id = getattr(owner, 'pk', owner)
+        return self.using(shard_for_owner(owner_id)).filter(owner_id=owner_id)
+
+    def create(self, **kwargs):
+        # QuerySet.create() saves with an explicit alias, bypassing the router's
+        # instance hint, so pick the owner's shard here.
+        if self._db is None:
+            owner = kwargs.get('owner')
+            owner_id = owner.pk if owner is not None else kwargs.get('owner_id')
+            if owner_id is not None:
+                return self.using(shard_for_owner(owner_id)).create(**kwargs)
+        return super().create(**kwargs)
+
 
 # PUBLIC_INTERFACE
 class Note(models.Model):
@@ -11,19 +33,55 @@ class Note(models.Model):
         title (str): The title of the note (max 200 chars).
         content (str): The content/body of the note.
         owner (User): ForeignKey to User - only owner can access/modify.
+            Notes are stored on the owner's shard while users stay on the
+            default database, so the foreign key has no database constraint.
         created_at (datetime): When the note was created.
         updated_at (datetime): When the note was last modified.
     """
 
     title = models.CharField(max_length=200)
     content = models.TextField()
-    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notes')
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notes', db_constraint=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = NoteQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Per-owner listing in the API, ordered by most recently updated.
+            models.Index(fields=['owner', '-updated_at'], name='note_owner_updated_idx'),
+            # Admin date hierarchy navigation.
+            models.Index(fields=['created_at'], name='note_created_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
+# PUBLIC_INTERFACE
+def move_notes(notes, source, target):
+    """
+    Move `notes` from the `source` database to the `target` shard, keeping their IDs.
+
+    Each shard allocates note IDs from its own range (see NOTE_SHARDS), so a
+    note's ID is free on every other shard. Safe to retry after an
+    interruption: a note already on the target with the same ID and owner is
+    the earlier copy and is not copied again. Any other note holding the ID
+    raises IntegrityError rather than being overwritten.
+    """
+    pks = [note.pk for note in notes]
+    with transaction.atomic(using=target):
+        existing = dict(Note.objects.using(target).filter(pk__in=pks).values_list('pk', 'owner_id'))
+        for note in notes:
+            if note.pk in existing:
+                if existing[note.pk] != note.owner_id:
+                    raise IntegrityError(f"Note ID {note.pk} is already used on {target} by another owner.")
+                continue
+            # raw=True keeps created_at/updated_at instead of resetting them.
+            note.save_base(using=target, raw=True, force_insert=True)
+    Note.objects.using(source).filter(pk__in=pks).delete()
+
+
 # PUBLIC_INTERFACE
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for Django's built-in User model."""
@@ -0,0 +1,101 @@
+import bisect
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Points placed on the hash ring per shard; more points give a smoother spread.
+VIRTUAL_NODES = 64
+
+# Note IDs on shard number n start above n * NOTE_ID_RANGE. Kept below 2**53
+# for any sane shard count so IDs stay exact in JavaScript clients.
+NOTE_ID_RANGE = 10 ** 12
+
+
+def _hash(key):
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+
+@lru_cache(maxsize=None)
+def _ring(shards):
+    return sorted(
+        (_hash(f'{alias}#{i}'), alias)
+        for alias in shards
+        for i in range(VIRTUAL_NODES)
+    )
+
+
+# PUBLIC_INTERFACE
+def get_note_shards():
+    """Return the database aliases notes are partitioned across (settings.NOTE_SHARDS)."""
+    return tuple(getattr(settings, 'NOTE_SHARDS', {DEFAULT_DB_ALIAS: 0}))
+
+
+# PUBLIC_INTERFACE
+def note_id_base(alias):
+    """Return the value new note IDs on shard `alias` start above."""
+    return getattr(settings, 'NOTE_SHARDS', {DEFAULT_DB_ALIAS: 0})[alias] * NOTE_ID_RANGE
+
+
+# PUBLIC_INTERFACE
+def shard_for_owner(owner_id):
+    """
+    Map an owner (user) ID to the database alias holding that user's notes.
+
+    Uses a consistent hash ring, so adding or removing a shard only moves
+    the owners that land on the changed part of the ring.
+    """
+    ring = _ring(get_note_shards())
+    # int() so that e.g. '05' and 5 land on the same shard.
+    index = bisect.bisect(ring, (_hash(str(int(owner_id))),))
+    return ring[index % len(ring)][1]
+
+
+def _is_note(model):
+    return model._meta.app_label == 'api' and model._meta.model_name == 'note'
+
+
+# PUBLIC_INTERFACE
+class NoteShardRouter:
+    """
+    Database router that partitions notes by owner across settings.NOTE_SHARDS.
+
+    Every other model (users, sessions, token blacklist, ...) lives on the
+    default database. Note queries need an owner to be routed; use
+    Note.objects.for_owner(user) rather than a bare Note.objects.filter(owner=...).
+    """
+
+    def _owner_shard(self, model, hints):
+        instance = hints.get('instance')
+        if instance is None:
+            return None
+        if _is_note(instance):
+            return shard_for_owner(instance.owner_id) if instance.owner_id else None
+        # Reverse access from a user, e.g. user.notes.all().
+        if instance._meta.label == settings.AUTH_USER_MODEL and instance.pk is not None:
+            return shard_for_owner(instance.pk)
+        return None
+
+    def db_for_read(self, model, **hints):
+        if _is_note(model):
+            return self._owner_shard(model, hints)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if _is_note(model):
+            return self._owner_shard(model, hints)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Note.owner points across databases; the FK has no DB constraint.
+        if _is_note(obj1) or _is_note(obj2):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == DEFAULT_DB_ALIAS:
+            return None
+        if db in get_note_shards():
+            return app_label == 'api'
+        return None
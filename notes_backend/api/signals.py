@@ -0,0 +1,54 @@
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate
+from django.dispatch import receiver
+from .models import Note
+from .routers import get_note_shards, note_id_base
+
+# PUBLIC_INTERFACE
+@receiver(post_delete, sender=User)
+def delete_sharded_notes(sender, instance, using, **kwargs):
+    """
+    Delete a user's notes from their shard once the user's deletion commits.
+
+    The ORM cascade only reaches notes on the database the user is deleted
+    from, so notes on the user's shard are removed here. Waiting for the
+    commit means a rolled-back deletion leaves the notes in place.
+    """
+    owner_id = instance.pk
+    transaction.on_commit(lambda: Note.objects.for_owner(owner_id).delete(), using=using)
+
+
+# PUBLIC_INTERFACE
+@receiver(post_migrate)
+def reserve_note_id_range(sender, using, **kwargs):
+    """
+    Start the note ID sequence of each shard at that shard's own range.
+
+    Keeps note IDs unique across shards, so notes can move between shards
+    without changing ID. Only ever raises the sequence.
+    """
+    if sender.label != 'api' or using not in get_note_shards():
+        return
+    connection = connections[using]
+    table = Note._meta.db_table
+    if table not in connection.introspection.table_names():
+        return
+    base = note_id_base(using)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                "INSERT INTO sqlite_sequence (name, seq) SELECT %s, %s "
+                "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = %s)",
+                [table, base, table],
+            )
+            cursor.execute(
+                "UPDATE sqlite_sequence SET seq = %s WHERE name = %s AND seq < %s",
+                [base, table, base],
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+                f"GREATEST(%s, (SELECT COALESCE(MAX(id), 0) FROM {connection.ops.quote_name(table)})))",
+                [table, base],
+            )
@@ -1,5 +1,16 @@
+import os
+from io import StringIO
+from unittest import mock
+
 from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import IntegrityError, connection, connections, transaction
+from django.test import TestCase
 from django.urls import reverse
+from .admin import EstimatedCountPaginator
+from .models import Note, NoteQuerySet
+from .routers import NOTE_ID_RANGE, get_note_shards, note_id_base, shard_for_owner
 
 class HealthTests(APITestCase):
     def test_health(self):
@@ -7,3 +18,207 @@ class HealthTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data, {"message": "Server is up!"})
+
+
+class NoteAdminTests(TestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.alice = User.objects.create_user('alice', password='pass')
+        self.bob = User.objects.create_user('bob', password='pass')
+        Note.objects.create(title='Groceries', content='milk', owner=self.alice)
+        Note.objects.create(title='Meeting', content='groceries later', owner=self.bob)
+        self.client.force_login(self.admin_user)
+        self.url = reverse('admin:api_note_changelist')
+
+    def test_sidebar_offers_owner_id_input(self):
+        response = self.client.get(self.url, {'updated_at__gte': '2000-01-01'})
+        self.assertContains(response, 'name="owner"')
+        self.assertContains(response, '<input type="hidden" name="updated_at__gte" value="2000-01-01">', html=True)
+
+    def test_filter_by_owner_id(self):
+        response = self.client.get(self.url, {'owner': self.alice.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([n.title for n in response.context['cl'].result_list], ['Groceries'])
+
+    def test_search_matches_title_prefix_not_content(self):
+        response = self.client.get(self.url, {'q': 'groc', 'shard': shard_for_owner(self.alice.pk)})
+        self.assertEqual([n.title for n in response.context['cl'].result_list], ['Groceries'])
+
+    def test_search_exact_owner_username(self):
+        response = self.client.get(self.url, {'q': 'bob', 'shard': shard_for_owner(self.bob.pk)})
+        self.assertEqual([n.title for n in response.context['cl'].result_list], ['Meeting'])
+
+    def test_change_view_reads_owner_shard(self):
+        note = Note.objects.for_owner(self.bob).get()
+        url = reverse('admin:api_note_change', args=[note.pk])
+        response = self.client.get(url, {'_changelist_filters': f'owner={self.bob.pk}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['original'].title, 'Meeting')
+
+    def _user_on_other_shard(self, user):
+        for i in range(100):
+            other = User.objects.create_user(f'other{i}')
+            if shard_for_owner(other.pk) != shard_for_owner(user.pk):
+                return other
+        self.fail('no user on another shard')
+
+    def test_changelist_defaults_to_first_shard(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['cl'].queryset.db, get_note_shards()[0])
+        cl = response.context['cl']
+        choices = list(cl.filter_specs[0].choices(cl))
+        self.assertEqual([c['display'] for c in choices], list(get_note_shards()))
+        self.assertEqual([c['selected'] for c in choices].index(True), 0)
+
+    def test_change_view_finds_note_without_filters(self):
+        note = Note.objects.for_owner(self.bob).get()
+        response = self.client.get(reverse('admin:api_note_change', args=[note.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['original'].title, 'Meeting')
+
+    def test_change_view_resolves_colliding_id_to_shown_shard(self):
+        first, second = get_note_shards()[:2]
+        Note.objects.using(first).create(pk=77, title='First', content='', owner=self.alice)
+        Note.objects.using(second).create(pk=77, title='Second', content='', owner=self.bob)
+        url = reverse('admin:api_note_change', args=[77])
+        response = self.client.get(url)
+        self.assertEqual(response.context['original'].title, 'First')
+        response = self.client.get(url, {'_changelist_filters': f'shard={second}'})
+        self.assertEqual(response.context['original'].title, 'Second')
+
+    def test_change_view_refuses_ambiguous_id(self):
+        second, third = get_note_shards()[1:3]
+        Note.objects.using(second).create(pk=77, title='Second', content='', owner=self.alice)
+        Note.objects.using(third).create(pk=77, title='Third', content='', owner=self.bob)
+        response = self.client.get(reverse('admin:api_note_change', args=[77]), follow=True)
+        self.assertIn('several shards', ' '.join(str(m) for m in response.context['messages']))
+
+    def test_changing_owner_moves_note_keeping_id(self):
+        carol = self._user_on_other_shard(self.alice)
+        note = Note.objects.for_owner(self.alice).get()
+        response = self.client.post(
+            reverse('admin:api_note_change', args=[note.pk]),
+            {'title': 'Groceries', 'content': 'milk', 'owner': carol.pk},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Note.objects.for_owner(self.alice).exists())
+        self.assertEqual(Note.objects.for_owner(carol).get().pk, note.pk)
+
+    def test_changing_owner_never_overwrites_other_note(self):
+        carol = self._user_on_other_shard(self.alice)
+        note = Note.objects.for_owner(self.alice).get()
+        Note.objects.using(shard_for_owner(carol.pk)).create(pk=note.pk, title='Carol', content='', owner=self.bob)
+        with self.assertRaises(IntegrityError):
+            self.client.post(
+                reverse('admin:api_note_change', args=[note.pk]),
+                {'title': 'Groceries', 'content': 'milk', 'owner': carol.pk},
+            )
+        self.assertEqual(Note.objects.using(shard_for_owner(carol.pk)).get(pk=note.pk).title, 'Carol')
+
+    def test_owner_filter_normalises_id(self):
+        response = self.client.get(self.url, {'owner': f'0{self.alice.pk}'})
+        self.assertEqual([n.title for n in response.context['cl'].result_list], ['Groceries'])
+
+    def test_title_prefix_search_uses_index(self):
+        queryset = Note.objects.filter(title__istartswith='groc')
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('note_title_prefix_idx', plan)
+
+    def test_analyze_notes_provides_estimate(self):
+        call_command('analyze_notes', stdout=StringIO())
+        with connections[shard_for_owner(self.alice.pk)].cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'api_note'")
+            self.assertGreater(cursor.fetchone()[0], 0)
+
+    def test_paginator_uses_sqlite_stats_when_unfiltered(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            cursor.execute("DELETE FROM sqlite_stat1 WHERE tbl = 'api_note'")
+            cursor.execute("INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES ('api_note', NULL, '50000')")
+        self.assertEqual(EstimatedCountPaginator(Note.objects.order_by('-pk'), 100).count, 50000)
+        self.assertEqual(EstimatedCountPaginator(Note.objects.filter(title='Groceries').order_by('-pk'), 100).count,
+                         Note.objects.filter(title='Groceries').count())
+
+
+class NoteShardingTests(APITestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        self.users = [User.objects.create_user(f'user{i}') for i in range(40)]
+
+    def test_owners_spread_across_all_shards(self):
+        shards = {shard_for_owner(user.pk) for user in self.users}
+        self.assertEqual(shards, set(get_note_shards()))
+        self.assertEqual(shard_for_owner(self.users[0].pk), shard_for_owner(self.users[0].pk))
+
+    def test_api_writes_and_reads_owner_shard(self):
+        user = self.users[0]
+        self.client.force_authenticate(user)
+        response = self.client.post(reverse('note-list'), {'title': 'Hello', 'content': 'World'})
+        self.assertEqual(response.status_code, 201)
+        shard = shard_for_owner(user.pk)
+        for alias in get_note_shards():
+            self.assertEqual(Note.objects.using(alias).filter(owner=user).exists(), alias == shard)
+        response = self.client.get(reverse('note-list'))
+        self.assertEqual([note['title'] for note in response.data], ['Hello'])
+        self.assertEqual(response.data[0]['owner'], user.username)
+
+    def test_note_ids_come_from_shard_range(self):
+        for user in self.users[:8]:
+            note = Note.objects.create(title='Hi', content='', owner=user)
+            base = note_id_base(shard_for_owner(user.pk))
+            self.assertTrue(base < note.pk < base + NOTE_ID_RANGE)
+
+    def test_rebalance_moves_notes_to_owner_shard(self):
+        user = self.users[0]
+        note = Note.objects.using('default').create(title='Old', content='pre-sharding', owner=user)
+        new = Note.objects.create(title='New', content='', owner=user)
+        call_command('rebalance_notes', stdout=StringIO())
+        self.assertFalse(Note.objects.using('default').exists())
+        self.assertEqual(
+            dict(Note.objects.for_owner(user).values_list('pk', 'title')), {note.pk: 'Old', new.pk: 'New'}
+        )
+        moved = Note.objects.for_owner(user).get(pk=note.pk)
+        self.assertEqual(moved.created_at, note.created_at)
+
+    def test_rebalance_resumes_after_interruption(self):
+        user = self.users[0]
+        old = Note.objects.using('default').create(title='Old', content='', owner=user)
+        with mock.patch.object(NoteQuerySet, 'delete', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                call_command('rebalance_notes', stdout=StringIO())
+        self.assertTrue(Note.objects.for_owner(user).filter(pk=old.pk).exists())
+        call_command('rebalance_notes', stdout=StringIO())
+        self.assertFalse(Note.objects.using('default').exists())
+        self.assertEqual(list(Note.objects.for_owner(user).values_list('pk', flat=True)), [old.pk])
+
+    def test_shard_for_owner_normalises_id(self):
+        self.assertEqual(shard_for_owner('05'), shard_for_owner(5))
+
+    def test_deleting_user_deletes_sharded_notes(self):
+        user = self.users[0]
+        shard = shard_for_owner(user.pk)
+        Note.objects.create(title='Bye', content='', owner=user)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.delete()
+        self.assertFalse(Note.objects.using(shard).exists())
+
+    def test_rolled_back_user_delete_keeps_notes(self):
+        user = self.users[0]
+        Note.objects.create(title='Keep', content='', owner=user)
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                User.objects.get(pk=user.pk).delete()
+                raise RuntimeError
+        self.assertTrue(Note.objects.for_owner(user).exists())
+
+    def test_shards_are_separate_sqlite_files(self):
+        names = {connections[alias].settings_dict['NAME'] for alias in get_note_shards()}
+        self.assertEqual(len(names), len(get_note_shards()))
+        for name in names:
+            self.assertTrue(os.path.isfile(name))
@@ -231,9 +231,9 @@ class NoteViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """
-        Limit notes to those owned by the request user.
+        Limit notes to those owned by the request user, read from that user's shard.
         """
-        return Note.objects.filter(owner=self.request.user)
+        return Note.objects.for_owner(self.request.user)
 
     def perform_create(self, serializer):
         """
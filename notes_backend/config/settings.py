@@ -96,9 +96,38 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    },
+    'notes_1': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_notes_1.sqlite3',
+        'TEST': {'NAME': BASE_DIR / 'test_db_notes_1.sqlite3'},
+    },
+    'notes_2': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_notes_2.sqlite3',
+        'TEST': {'NAME': BASE_DIR / 'test_db_notes_2.sqlite3'},
+    },
+    'notes_3': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_notes_3.sqlite3',
+        'TEST': {'NAME': BASE_DIR / 'test_db_notes_3.sqlite3'},
+    },
+    'notes_4': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_notes_4.sqlite3',
+        'TEST': {'NAME': BASE_DIR / 'test_db_notes_4.sqlite3'},
+    },
 }
 
+# Notes are partitioned by owner across these aliases (see api/routers.py);
+# users, sessions and tokens stay on 'default'. The number fixes the shard's
+# note ID range, so IDs are unique across shards: never reuse or change one.
+# Each alias needs `manage.py migrate --database <alias>`; after changing this
+# setting (or to move pre-sharding notes out of 'default') run
+# `manage.py rebalance_notes`.
+NOTE_SHARDS = {'notes_1': 1, 'notes_2': 2, 'notes_3': 3, 'notes_4': 4}
+DATABASE_ROUTERS = ['api.routers.NoteShardRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators